@@ -1,14 +1,23 @@
+import os
+import re
+import codecs
+import mmap
+import shutil
+import multiprocessing
+import tempfile
 import requests
 import logging
 import html
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Union, Dict
+from typing import Iterator, List, Optional, Tuple, Union, Dict
 
 from docx import Document
 from ebooklib import epub, ITEM_DOCUMENT
 from fpdf import FPDF
-from bs4 import BeautifulSoup
+from lxml import etree
 import pypdf
 
 # OCR (optional)
@@ -25,6 +34,56 @@ warnings.filterwarnings("ignore", module="pypdf")
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Non-whitespace control, format, surrogate and private-use characters (BMP)
+_CTRL_RE = re.compile(
+    r"[\u0000-\u0008\u000e-\u001b\u007f-\u0084\u0086-\u009f\u00ad\u0600-\u0605"
+    r"\u061c\u06dd\u070f\u0890-\u0891\u08e2\u180e\u200b-\u200f\u202a-\u202e"
+    r"\u2060-\u2064\u2066-\u206f\ud800-\uf8ff\ufeff\ufff9-\ufffb]"
+)
+
+# Below this many pages, process start-up costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 8
+
+# Paragraphs per XHTML chapter in exported EPUBs
+EPUB_CHAPTER_SIZE = 500
+
+# Inputs larger than this are memory-mapped instead of read into memory
+MMAP_MIN_BYTES = 32 * 1024 * 1024
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only mmap usable where a binary file object is expected (zipfile needs seekable())."""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+
+@contextmanager
+def _open_source(path: Path):
+    """Yield a memory map for large files and the path itself for small ones."""
+    if path.stat().st_size < MMAP_MIN_BYTES:
+        yield path
+        return
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        mapped = _MappedFile(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+    with mapped:
+        yield mapped
+
+
+def _extract_pdf_pages(args: Tuple[str, int, int]) -> List[str]:
+    """Extract text for pages [start, stop) of a PDF. Runs in a worker process."""
+    path, start, stop = args
+    reader = pypdf.PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
 class DocumentProcessor:
     FONT_URLS = {
         "latin": "https://github.com/googlefonts/noto-fonts/raw/main/hinted/ttf/NotoSans/NotoSans-Regular.ttf",
@@ -46,10 +105,16 @@ class DocumentProcessor:
         "portuguese": "latin",
     }
 
-    def __init__(self, output_dir: Union[str, Path]):
+    def __init__(self, output_dir: Union[str, Path], pdf_workers: Optional[int] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Processes per PDF extraction; callers running several jobs at once
+        # should pass their share of the CPUs
+        if pdf_workers is None:
+            pdf_workers = os.cpu_count() or 1
+        self.pdf_workers = max(1, pdf_workers)
+
         self.font_dir = Path(__file__).parent / "fonts"
         self.font_dir.mkdir(parents=True, exist_ok=True)
         self.font_cache: Dict[str, Path] = {}
@@ -65,14 +130,22 @@ class DocumentProcessor:
         font_path = self.font_dir / Path(url).name
 
         if not font_path.exists():
+            # Each download streams to its own temp file and is renamed into place,
+            # so concurrent jobs never write to or load a partial font
+            fd, tmp_name = tempfile.mkstemp(dir=self.font_dir, prefix=font_path.name, suffix=".part")
+            tmp_path = Path(tmp_name)
             try:
                 logger.info(f"Downloading font: {font_path.name}")
-                r = requests.get(url, timeout=30)
-                r.raise_for_status()
-                font_path.write_bytes(r.content)
+                with os.fdopen(fd, "wb") as f, requests.get(url, timeout=30, stream=True) as r:
+                    r.raise_for_status()
+                    r.raw.decode_content = True
+                    shutil.copyfileobj(r.raw, f, 1 << 20)
+                tmp_path.replace(font_path)
             except Exception as e:
-                logger.warning(f"Failed to download font {font_path.name}: {e}")
-                return None
+                tmp_path.unlink(missing_ok=True)
+                if not font_path.exists():
+                    logger.warning(f"Failed to download font {font_path.name}: {e}")
+                    return None
 
         self.font_cache[key] = font_path
         return font_path
@@ -81,59 +154,103 @@ class DocumentProcessor:
     def _clean_text(value) -> str:
         if value is None:
             return ""
-        text = str(value)
-        return "".join(ch for ch in text if ch.isprintable() or ch.isspace()).strip()
+        return _CTRL_RE.sub("", str(value)).strip()
 
     # -------------------- EXTRACTION --------------------
     def extract_paragraphs(self, file_path: str) -> List[Dict[str, str]]:
+        return list(self.iter_paragraphs(file_path))
+
+    def iter_paragraphs(self, file_path: str) -> Iterator[Dict[str, str]]:
+        """Yield cleaned paragraphs as they are extracted, without building the full list."""
         path = Path(file_path)
         ext = path.suffix.lower()
-        content: List[Dict[str, str]] = []
 
         if ext == ".docx":
-            doc = Document(path)
+            with _open_source(path) as source:
+                doc = Document(source)
             for p in doc.paragraphs:
                 txt = self._clean_text(p.text)
                 if txt:
                     style = getattr(p.style, "name", "Normal")
-                    content.append({"text": txt, "style": style})
-            return content
+                    yield {"text": txt, "style": style}
+            return
 
         if ext == ".txt":
-            return [
-                {"text": self._clean_text(l), "style": "Normal"}
-                for l in path.read_text(encoding="utf-8", errors="ignore").splitlines()
-                if l.strip()
-            ]
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                # File iteration only breaks on \n and \r; splitlines() also
+                # breaks on form feeds, \u2028 etc., as read_text().splitlines() did
+                for line in f:
+                    for l in line.splitlines():
+                        if l.strip():
+                            yield {"text": self._clean_text(l), "style": "Normal"}
+            return
 
         if ext == ".pdf":
-            reader = pypdf.PdfReader(path)
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    for p in text.split("\n"):
-                        if len(p.strip()) > 3:
-                            content.append({"text": self._clean_text(p), "style": "Normal"})
-
-            if not content and OCR_AVAILABLE:
-                for img in convert_from_path(path, dpi=200):
-                    for p in pytesseract.image_to_string(img).split("\n"):
-                        if len(p.strip()) > 3:
-                            content.append({"text": self._clean_text(p), "style": "Normal"})
-            return content
+            found = False
+            for text in self._iter_pdf_text(path):
+                for para in self._split_page_text(text):
+                    found = True
+                    yield para
+
+            if not found and OCR_AVAILABLE:
+                # Tesseract runs as a subprocess, so threads overlap the pages;
+                # same per-job CPU share as text extraction
+                workers = self.pdf_workers
+                images = convert_from_path(path, dpi=200, thread_count=workers)
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    for text in ex.map(pytesseract.image_to_string, images):
+                        yield from self._split_page_text(text)
+            return
 
         if ext == ".epub":
-            book = epub.read_epub(str(path))
+            with _open_source(path) as source:
+                book = epub.read_epub(source if isinstance(source, mmap.mmap) else str(path))
+            # EPUB content documents are UTF-8 or (with a BOM) UTF-16; libxml2's
+            # HTML parser would otherwise guess Latin-1 when nothing is declared
+            boms = {codecs.BOM_UTF16_LE: "utf-16le", codecs.BOM_UTF16_BE: "utf-16be"}
+            parsers = {
+                enc: etree.HTMLParser(encoding=enc, remove_comments=True, remove_pis=True)
+                for enc in ("utf-8", *boms.values())
+            }
             for item in book.get_items_of_type(ITEM_DOCUMENT):
-                soup = BeautifulSoup(item.get_content(), "html.parser")
-                for tag in soup.find_all(["p", "h1", "h2", "h3", "li"]):
-                    txt = self._clean_text(tag.get_text())
+                content = item.get_content()
+                tree = etree.fromstring(content, parsers[boms.get(content[:2], "utf-8")])
+                if tree is None:
+                    continue
+                for el in tree.iter("p", "h1", "h2", "h3", "li"):
+                    txt = self._clean_text("".join(el.itertext()))
                     if txt:
-                        content.append({"text": txt, "style": tag.name})
-            return content
+                        yield {"text": txt, "style": el.tag}
+            return
 
         raise ValueError(f"Unsupported format: {ext}")
 
+    def _split_page_text(self, text: str) -> Iterator[Dict[str, str]]:
+        for p in (text or "").split("\n"):
+            if len(p.strip()) > 3:
+                yield {"text": self._clean_text(p), "style": "Normal"}
+
+    def _iter_pdf_text(self, path: Path) -> Iterator[str]:
+        """Yield the text of each page in order, spreading long PDFs across processes."""
+        with _open_source(path) as source:
+            reader = pypdf.PdfReader(source)
+            n_pages = len(reader.pages)
+            workers = min(self.pdf_workers, n_pages)
+
+            if n_pages < PDF_PARALLEL_MIN_PAGES or workers < 2:
+                for page in reader.pages:
+                    yield page.extract_text() or ""
+                return
+
+        # A few ranges per worker so one slow range doesn't stall the rest
+        step = max(1, -(-n_pages // (workers * 4)))
+        ranges = [(str(path), i, min(i + step, n_pages)) for i in range(0, n_pages, step)]
+        # Spawn, not fork: this runs on a worker thread of a process holding
+        # sqlite and HTTP client state
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for chunk in pool.map(_extract_pdf_pages, ranges):
+                yield from chunk
+
     # -------------------- EXPORT --------------------
     def save_by_format(self, paragraphs: List[Dict], fmt: str, language: str, job_id: str) -> Path:
         fmt = fmt.lower()
@@ -160,20 +277,29 @@ class DocumentProcessor:
         pdf.set_auto_page_break(auto=True, margin=15)
         pdf.add_page()
 
+        font_name = "Helvetica"
         font_path = self._get_font_for_language(language)
         if font_path:
             try:
                 pdf.add_font("Custom", "", str(font_path), uni=True)
-                pdf.set_font("Custom", size=11)
+                font_name = "Custom"
             except Exception as e:
                 logger.warning(f"Failed to load font for PDF: {e}")
-                pdf.set_font("Helvetica", size=11)
-        else:
-            pdf.set_font("Helvetica", size=11)
+
+        # Few distinct styles per document, so size each one once
+        style_sizes = {
+            style: 16 if "heading" in str(style).lower() else 11
+            for style in {p.get("style", "") for p in paragraphs}
+        }
+
+        current_size = 11
+        pdf.set_font(font_name, size=current_size)
 
         for p in paragraphs:
-            size = 16 if "heading" in str(p.get("style", "")).lower() else 11
-            pdf.set_font("Custom" if font_path else "Helvetica", size=size)
+            size = style_sizes[p.get("style", "")]
+            if size != current_size:
+                pdf.set_font(font_name, size=size)
+                current_size = size
             pdf.multi_cell(0, 8, self._clean_text(p.get("text", "")))
             pdf.ln(2)
 
@@ -198,16 +324,28 @@ class DocumentProcessor:
         book.set_title("Translated Document")
         book.set_language(language)
 
-        body = "<html><body>"
-        for p in paragraphs:
-            body += f"<p>{html.escape(self._clean_text(p.get('text', '')))}</p>"
-        body += "</body></html>"
-
-        chapter = epub.EpubHtml(title="Content", file_name="content.xhtml", content=body)
-        book.add_item(chapter)
-        book.toc = (chapter,)
+        # Split long documents into several chapters so readers can render incrementally
+        chapters = []
+        for start in range(0, max(len(paragraphs), 1), EPUB_CHAPTER_SIZE):
+            parts = ["<html><body>"]
+            parts.extend(
+                f"<p>{html.escape(self._clean_text(p.get('text', '')))}</p>"
+                for p in paragraphs[start:start + EPUB_CHAPTER_SIZE]
+            )
+            parts.append("</body></html>")
+
+            n = len(chapters) + 1
+            chapter = epub.EpubHtml(
+                title="Content" if n == 1 else f"Content ({n})",
+                file_name="content.xhtml" if n == 1 else f"content_{n}.xhtml",
+                content="".join(parts),
+            )
+            book.add_item(chapter)
+            chapters.append(chapter)
+
+        book.toc = tuple(chapters)
         book.add_item(epub.EpubNcx())
         book.add_item(epub.EpubNav())
-        book.spine = ["nav", chapter]
+        book.spine = ["nav", *chapters]
 
         epub.write_epub(str(output_path), book)
@@ -0,0 +1,136 @@
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, MutableMapping, Optional
+
+# Redis backend (optional)
+try:
+    import redis
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Finished jobs are dropped from Redis after a week
+JOB_TTL_SECONDS = 7 * 24 * 3600
+
+
+class JobStore:
+    """Job status records shared by the API and the job workers.
+
+    Records live in Redis (``HSET job:{id}``, updates published on ``jobs:{id}``)
+    when a URL is given, otherwise in a plain or ``multiprocessing.Manager`` dict.
+    The store pickles to its URL or mapping, so it can be handed to worker processes.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, mapping: Optional[MutableMapping] = None):
+        self.redis_url = redis_url if redis_url and REDIS_AVAILABLE else None
+        if redis_url and not REDIS_AVAILABLE:
+            logger.warning("REDIS_URL is set but redis is not installed; keeping jobs in memory")
+
+        self._redis = redis.Redis.from_url(self.redis_url, decode_responses=True) if self.redis_url else None
+        self._local = mapping if mapping is not None else {}
+
+    def __reduce__(self):
+        return (JobStore, (self.redis_url, None if self.redis_url else self._local))
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def channel(job_id: str) -> str:
+        return f"jobs:{job_id}"
+
+    # -------------------- READ --------------------
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if self._redis is None:
+            return self._local.get(job_id)
+
+        raw = self._redis.hgetall(self._key(job_id))
+        return {k: json.loads(v) for k, v in raw.items()} if raw else None
+
+    def __contains__(self, job_id: str) -> bool:
+        if self._redis is None:
+            return job_id in self._local
+        return bool(self._redis.exists(self._key(job_id)))
+
+    def __getitem__(self, job_id: str) -> Dict[str, Any]:
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        return job
+
+    # -------------------- WRITE --------------------
+    def __setitem__(self, job_id: str, record: Dict[str, Any]):
+        if self._redis is None:
+            self._local[job_id] = record
+            return
+
+        key = self._key(job_id)
+        pipe = self._redis.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={k: json.dumps(v) for k, v in record.items()})
+        pipe.expire(key, JOB_TTL_SECONDS)
+        pipe.publish(self.channel(job_id), json.dumps(record))
+        pipe.execute()
+
+    def update(self, job_id: str, **fields):
+        if self._redis is None:
+            # Manager dict proxies return copies, so write the whole record back
+            job = self._local[job_id]
+            job.update(fields)
+            self._local[job_id] = job
+            return
+
+        key = self._key(job_id)
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping={k: json.dumps(v) for k, v in fields.items()})
+        pipe.hgetall(key)
+        _, raw = pipe.execute()
+        record = {k: json.loads(v) for k, v in raw.items()}
+        self._redis.publish(self.channel(job_id), json.dumps(record))
+
+    # -------------------- SUBSCRIBE --------------------
+    async def watch(self, job_id: str, poll_interval: float = 1.0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the job record whenever it changes, ending once it is complete."""
+        if self._redis is None:
+            # No pub/sub in memory; poll for changes instead (Manager proxy calls block)
+            last = None
+            while True:
+                job = await asyncio.to_thread(self.get, job_id)
+                if job is None:
+                    return
+                if job != last:
+                    last = job
+                    yield job
+                if job.get("complete"):
+                    return
+                await asyncio.sleep(poll_interval)
+
+        client = aioredis.Redis.from_url(self.redis_url, decode_responses=True)
+        pubsub = client.pubsub()
+        try:
+            # Subscribe before reading so no update slips in between
+            await pubsub.subscribe(self.channel(job_id))
+            raw = await client.hgetall(self._key(job_id))
+            if not raw:
+                return
+            job = {k: json.loads(v) for k, v in raw.items()}
+            yield job
+            if job.get("complete"):
+                return
+
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                job = json.loads(message["data"])
+                yield job
+                if job.get("complete"):
+                    return
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
@@ -1,12 +1,18 @@
 import os
 import uuid
+import asyncio
 import logging
-import shutil
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import List, Optional, Set
 
+import aiofiles
 from dotenv import load_dotenv
-from fastapi import FastAPI, UploadFile, File, BackgroundTasks, HTTPException, Query
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -15,10 +21,11 @@ from pydantic import BaseModel
 try:
     from document_processor import DocumentProcessor
     from translation_engine import TranslationEngine
+    from job_store import JobStore, REDIS_AVAILABLE
 except ImportError as e:
     raise ImportError(
         f"Missing supporting modules: {e}. "
-        "Ensure 'document_processor.py' and 'translation_engine.py' exist."
+        "Ensure 'document_processor.py', 'translation_engine.py' and 'job_store.py' exist."
     )
 
 load_dotenv()
@@ -28,10 +35,31 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # -------------------- APP --------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global jobs_db, JOB_POOL
+    # Jobs run in worker processes; progress goes through Redis, or a shared Manager dict
+    manager = None
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url and REDIS_AVAILABLE:
+        jobs_db = JobStore(redis_url=redis_url)
+    else:
+        manager = multiprocessing.Manager()
+        jobs_db = JobStore(redis_url=redis_url, mapping=manager.dict())
+    JOB_POOL = _new_job_pool()
+    try:
+        yield
+    finally:
+        JOB_POOL.shutdown(wait=False, cancel_futures=True)
+        JOB_POOL = None
+        if manager is not None:
+            manager.shutdown()
+
 app = FastAPI(
     title="AI Multi-Language Translation Studio",
     description="Professional eBook translation service",
-    version="2.6.9"
+    version="2.6.9",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -57,6 +85,7 @@ SUPPORTED_LANGS = {
 }
 
 SUPPORTED_INPUTS = {".docx", ".pdf", ".epub", ".txt"}
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MB
 SUPPORTED_OUTPUTS = {"docx", "pdf", "epub"}
 
 MIME_TYPES = {
@@ -65,10 +94,22 @@ MIME_TYPES = {
     "epub": "application/epub+zip",
 }
 
-jobs_db: Dict[str, dict] = {}
+JOB_WORKERS = max(1, int(os.getenv("JOB_WORKERS", str(os.cpu_count() or 1))))
 
-processor = DocumentProcessor(output_dir=str(OUTPUT_DIR))
-translator = TranslationEngine()
+# Replaced with a shared store and a process pool at startup
+jobs_db = JobStore()
+JOB_POOL: Optional[ProcessPoolExecutor] = None
+_job_pool_lock = threading.Lock()
+
+# Strong references so in-process workflow tasks aren't garbage collected
+running_jobs: Set[asyncio.Task] = set()
+
+# Jobs already run in parallel, so each PDF extraction gets its share of the CPUs
+processor = DocumentProcessor(
+    output_dir=str(OUTPUT_DIR),
+    pdf_workers=(os.cpu_count() or 1) // JOB_WORKERS,
+)
+translator = TranslationEngine(languages=SUPPORTED_LANGS)
 
 # -------------------- MODELS --------------------
 class JobStatus(BaseModel):
@@ -81,10 +122,67 @@ class JobStatus(BaseModel):
     languages: List[str] = []
 
 # -------------------- WORKFLOW --------------------
-def run_translation_workflow(job_id: str, file_path: str, languages: List[str], formats: List[str]):
+def update_job(job_id: str, **fields):
+    jobs_db.update(job_id, **fields)
+
+def _init_job_worker(shared_jobs_db: JobStore):
+    global jobs_db
+    jobs_db = shared_jobs_db
+
+def _new_job_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=JOB_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_job_worker,
+        initargs=(jobs_db,),
+    )
+
+def _replace_job_pool(broken: ProcessPoolExecutor) -> Optional[ProcessPoolExecutor]:
+    """Swap in a fresh pool; one dead worker leaves a ProcessPoolExecutor unusable for good."""
+    global JOB_POOL
+    with _job_pool_lock:
+        # Another submit or callback may already have replaced it
+        if JOB_POOL is broken:
+            logger.warning("Job worker died; starting a new process pool")
+            JOB_POOL = _new_job_pool()
+        return JOB_POOL
+
+def _submit_job(job_id: str, file_path: str, languages: List[str], formats: List[str]):
+    pool = JOB_POOL
+    try:
+        future = pool.submit(_run_job, job_id, file_path, languages, formats)
+    except BrokenProcessPool:
+        pool = _replace_job_pool(pool)
+        future = pool.submit(_run_job, job_id, file_path, languages, formats)
+    future.add_done_callback(lambda f: _on_job_done(job_id, file_path, pool, f))
+
+def _run_job(job_id: str, file_path: str, languages: List[str], formats: List[str]):
+    """Process pool entry point."""
+    async def job():
+        try:
+            await run_translation_workflow(job_id, file_path, languages, formats)
+        finally:
+            # Each job gets its own loop, so its HTTP client can't outlive it
+            await translator.aclose()
+
+    asyncio.run(job())
+
+def _on_job_done(job_id: str, file_path: str, pool: ProcessPoolExecutor, future: Future):
+    # Covers worker crashes, where the workflow never got to report its own failure
+    if not future.cancelled() and future.exception() is not None:
+        error = future.exception()
+        logger.error(f"Job {job_id} worker failed: {error}")
+        update_job(job_id, status="Failed", error=True, complete=True, message=str(error))
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        if isinstance(error, BrokenProcessPool):
+            _replace_job_pool(pool)
+
+async def run_translation_workflow(job_id: str, file_path: str, languages: List[str], formats: List[str]):
     try:
-        jobs_db[job_id].update(status="Extracting text", progress=5)
-        paragraphs = processor.extract_paragraphs(file_path)
+        update_job(job_id, status="Extracting text", progress=5)
+        # Extraction and export are CPU/disk bound; keep them off the event loop
+        paragraphs = await asyncio.to_thread(processor.extract_paragraphs, file_path)
 
         if not paragraphs:
             raise ValueError("Empty or unreadable document")
@@ -93,22 +191,27 @@ def run_translation_workflow(job_id: str, file_path: str, languages: List[str],
 
         for lang_idx, lang in enumerate(languages):
             translated = []
-            jobs_db[job_id]["status"] = f"Translating {lang.title()}"
+            update_job(job_id, status=f"Translating {lang.title()}")
 
-            for idx, para in enumerate(paragraphs):
+            def report(done: int, total: int, lang_idx: int = lang_idx):
+                progress = 10 + int(((lang_idx + done / total) / total_langs) * 80)
+                update_job(job_id, progress=progress)
+
+            texts = await translator.translate_many_async(
+                [p["text"] for p in paragraphs], lang, on_progress=report
+            )
+            for para, text in zip(paragraphs, texts):
                 translated.append({
-                    "text": translator.translate(para["text"], lang),
+                    "text": text,
                     "style": para.get("style", "Normal")
                 })
 
-                progress = 10 + int(((lang_idx + idx / len(paragraphs)) / total_langs) * 80)
-                jobs_db[job_id]["progress"] = progress
-
-            jobs_db[job_id]["status"] = f"Exporting {lang.title()}"
+            update_job(job_id, status=f"Exporting {lang.title()}")
             for fmt in formats:
-                processor.save_by_format(translated, fmt, lang, job_id)
+                await asyncio.to_thread(processor.save_by_format, translated, fmt, lang, job_id)
 
-        jobs_db[job_id].update(
+        update_job(
+            job_id,
             status="Completed",
             progress=100,
             complete=True,
@@ -117,7 +220,8 @@ def run_translation_workflow(job_id: str, file_path: str, languages: List[str],
 
     except Exception as e:
         logger.exception("Translation failed")
-        jobs_db[job_id].update(
+        update_job(
+            job_id,
             status="Failed",
             error=True,
             complete=True,
@@ -130,7 +234,6 @@ def run_translation_workflow(job_id: str, file_path: str, languages: List[str],
 # -------------------- ENDPOINTS --------------------
 @app.post("/api/translate", status_code=202)
 async def translate_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     languages: str = Query("spanish"),
     formats: str = Query("docx,pdf,epub")
@@ -148,29 +251,66 @@ async def translate_document(
         raise HTTPException(400, "Invalid language or format")
 
     input_path = INPUT_DIR / f"{job_id}{ext}"
-    with open(input_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    async with aiofiles.open(input_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
 
-    jobs_db[job_id] = {
+    # The job store may be Redis or a Manager proxy; keep its calls off the event loop
+    await asyncio.to_thread(jobs_db.__setitem__, job_id, {
         "status": "Queued",
         "progress": 0,
         "complete": False,
         "error": False,
         "filename": file.filename,
         "languages": [l.title() for l in langs],
-    }
-
-    background_tasks.add_task(run_translation_workflow, job_id, str(input_path), langs, fmts)
+    })
+
+    if JOB_POOL is not None:
+        try:
+            await asyncio.to_thread(_submit_job, job_id, str(input_path), langs, fmts)
+        except Exception as e:
+            logger.exception(f"Could not queue job {job_id}")
+            await asyncio.to_thread(
+                update_job, job_id, status="Failed", error=True, complete=True, message=str(e)
+            )
+            if input_path.exists():
+                input_path.unlink()
+            raise HTTPException(503, "Translation workers unavailable")
+    else:
+        # No lifespan (e.g. imported without the server); run on this loop
+        task = asyncio.create_task(run_translation_workflow(job_id, str(input_path), langs, fmts))
+        running_jobs.add(task)
+        task.add_done_callback(running_jobs.discard)
     return {"job_id": job_id}
 
+# Plain def: FastAPI runs these in its threadpool, so blocking job store reads
+# don't stall the event loop
 @app.get("/api/status/{job_id}", response_model=JobStatus)
-async def get_status(job_id: str):
-    if job_id not in jobs_db:
+def get_status(job_id: str):
+    job = jobs_db.get(job_id)
+    if job is None:
         raise HTTPException(404, "Job not found")
-    return {"job_id": job_id, **jobs_db[job_id]}
+    return {"job_id": job_id, **job}
+
+@app.websocket("/ws/status/{job_id}")
+async def watch_status(websocket: WebSocket, job_id: str):
+    """Push status updates until the job completes, instead of polling /api/status."""
+    await websocket.accept()
+    try:
+        found = False
+        async for job in jobs_db.watch(job_id):
+            found = True
+            status = JobStatus(job_id=job_id, **job)
+            await websocket.send_json(status.model_dump())
+        if not found:
+            await websocket.close(code=4404, reason="Job not found")
+            return
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
 
 @app.get("/api/download/{job_id}/{language}")
-async def download_translation(
+def download_translation(
     job_id: str,
     language: str,
     file_format: str = Query("docx")
@@ -1,17 +1,182 @@
 import os
 import re
+import asyncio
 import logging
+import hashlib
+import sqlite3
+import threading
+import time
 import requests
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# Fast JSON (optional)
+try:
+    import orjson
+    _json_dumps, _json_loads = orjson.dumps, orjson.loads
+except ImportError:
+    import json
+    _json_dumps = lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8")  # noqa: E731
+    _json_loads = json.loads
+
+# HTTP/2 client (optional)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+NETWORK_ERRORS = (requests.exceptions.RequestException,)
+if HTTPX_AVAILABLE:
+    NETWORK_ERRORS += (httpx.HTTPError,)
+
+SYSTEM_PROMPT_TEMPLATE = (
+    "You are a professional translator.\n"
+    "Target Language: {lang}\n"
+    "CRITICAL RULES:\n"
+    "1. Output ONLY the translated text.\n"
+    "2. Do NOT provide explanations or notes.\n"
+    "3. Preserve paragraph breaks and punctuation.\n"
+    "4. Maintain tone of the source."
+)
+
+# Retry policy for rate limits and transient server errors
+RETRY_TOTAL = 5
+RETRY_BACKOFF = 2
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Paragraphs per request, and an approximate source-token budget (len // 4)
+BATCH_SIZE = max(1, int(os.getenv("TRANSLATE_BATCH_SIZE", "8")))
+BATCH_MAX_TOKENS = 2000
+
+_BATCH_RE = re.compile(r"<<<P(\d+)>>>[ \t]*\n?(.*?)(?=<<<P\d+>>>|\Z)", re.DOTALL)
+
+# LLM boilerplate stripped from replies
+_BACKTICK_RE = re.compile(r"```(?:\w+)?\n?")
+# One optional group per prefix, in the order the old loop stripped them,
+# so stacked prefixes ("Translation: Output: ...") are all removed
+_PREFIX_RE = re.compile(
+    r"^(?:here is the translation:?\s*)?"
+    r"(?:translation:?\s*)?"
+    r"(?:output:?\s*)?"
+    r"(?:sure, here is the translation.*?:?\s*)?"
+    r"(?:the translated text is:?\s*)?"
+    r"(?:translated text:?\s*)?",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Paragraphs with nothing to translate: no letters at all (numbers, dates,
+# punctuation, bullets) or a bare URL
+_SKIP_RE = re.compile(r"^(?:[\W\d_]+|(?:https?://|www\.)\S+)$")
+
+# A line starting with one of these begins the model's commentary
+_STOP_RE = re.compile(
+    r"^[^\S\n]*(?:note:|\(note|translator's note|literally:|explanation:)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _retry_delay(attempt: int, response=None) -> float:
+    """Seconds to wait before retrying, honouring Retry-After as urllib3's Retry does."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return RETRY_BACKOFF * (2 ** attempt)
+
+
+class TranslationCache:
+    """Two-level translation cache: in-memory LRU backed by an optional sqlite file.
+
+    Entries are keyed by ``sha256(text.strip())||lang||model`` so they survive
+    across jobs and restarts.
+    """
+
+    def __init__(self, db_path: Union[str, Path, None] = None, maxsize: int = 8192):
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                # timeout: job worker processes share the file
+                self._db = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Translation cache disabled on disk ({db_path}): {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(text: str, lang: str, model: str) -> str:
+        digest = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+        return f"{digest}||{lang.lower()}||{model}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+
+    def set(self, key: str, value: str):
+        if not value:
+            return
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)",
+                        (key, value),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist translation: {e}")
+
+    def _remember(self, key: str, value: str):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
 
 class TranslationEngine:
-    def __init__(self, model: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        cache: Optional[TranslationCache] = None,
+        languages: Iterable[str] = (),
+    ):
         # -----------------------------
         # Load API key
         # -----------------------------
@@ -27,14 +192,31 @@ class TranslationEngine:
         self.model = model or "meta-llama/Meta-Llama-3-8B-Instruct"
         self.endpoint = "https://api.featherless.ai/v1/chat/completions"
 
+        # Prompt pieces that don't change between requests are built once;
+        # other languages are added to _system_msgs on first use
+        self._payload_template = {"model": self.model, "temperature": 0.1}
+        self._system_msgs: Dict[str, dict] = {}
+        for lang in languages:
+            self._system_message(lang)
+
+        # Number of paragraphs translated concurrently per job
+        self.max_workers = max(1, int(os.getenv("TRANSLATE_CONCURRENCY", "16")))
+
+        # -----------------------------
+        # Translation cache
+        # -----------------------------
+        self.cache = cache or TranslationCache(
+            os.getenv("TRANSLATION_CACHE_DB", str(Path(__file__).parent / "data" / "translation_cache.db"))
+        )
+
         # -----------------------------
         # HTTP session with retries
         # -----------------------------
         self.session = requests.Session()
         retry_params = dict(
-            total=5,
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504],
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=sorted(RETRY_STATUSES),
         )
 
         try:
@@ -42,14 +224,47 @@ class TranslationEngine:
         except TypeError:
             retries = Retry(method_whitelist=frozenset({"POST"}), **retry_params)
 
-        adapter = HTTPAdapter(max_retries=retries)
+        # Pool large enough that concurrent translate calls reuse
+        # keep-alive connections instead of queueing or re-handshaking
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=max(64, self.max_workers),
+            max_retries=retries,
+            pool_block=False,
+        )
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
-        self.session.headers.update({
+        headers = self._headers = {
             "Authorization": f"Bearer {clean_key}",
             "Content-Type": "application/json",
-        })
+        }
+        self.session.headers.update(headers)
+        self.session.headers["Connection"] = "keep-alive"
+
+        # -----------------------------
+        # Optional HTTP/2 client (multiplexes requests on one connection)
+        # -----------------------------
+        self.http2_client = None
+        if os.getenv("TRANSLATE_HTTP2", "").lower() in {"1", "true", "yes"}:
+            if not HTTPX_AVAILABLE:
+                logger.warning("TRANSLATE_HTTP2 is set but httpx is not installed; using requests")
+            else:
+                try:
+                    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+                    # No Connection header here: HTTP/2 forbids it
+                    self.http2_client = httpx.Client(
+                        http2=True,
+                        headers=headers,
+                        limits=httpx.Limits(max_connections=max(64, self.max_workers)),
+                        timeout=httpx.Timeout(180.0, connect=10.0),
+                    )
+                except ImportError as e:
+                    logger.warning(f"HTTP/2 unavailable ({e}); using requests")
+
+        # Async client for translate_*_async, created on first use in a loop
+        self._aclient: Optional["httpx.AsyncClient"] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
 
     # --------------------------------------------------
     # Clean API output
@@ -58,91 +273,370 @@ class TranslationEngine:
         if not text:
             return ""
 
-        # Remove backticks used for code markdown
-        text = re.sub(r"```(?:\w+)?\n?", "", text)  # opening triple backticks
-        text = text.replace("```", "")  # closing triple backticks
+        # Remove backticks used for code markdown (opening and closing)
+        text = _BACKTICK_RE.sub("", text)
         text = text.strip("` \n")
 
         # Remove common LLM prefixes
-        prefixes = [
-            r"^here is the translation:?\s*",
-            r"^translation:?\s*",
-            r"^output:?\s*",
-            r"^sure, here is the translation.*?:?\s*",
-            r"^the translated text is:?\s*",
-            r"^translated text:?\s*",
-        ]
-        for p in prefixes:
-            text = re.sub(p, "", text, flags=re.IGNORECASE | re.MULTILINE)
-
-        # Stop at explanatory notes
-        stop_keywords = ("note:", "(note", "translator's note", "literally:", "explanation:")
-        lines = []
-        for line in text.splitlines():
-            clean_line = line.strip().lower()
-            if any(clean_line.startswith(kw) for kw in stop_keywords):
+        text = _PREFIX_RE.sub("", text)
+
+        # Stop at explanatory notes; splitlines() first so every line break
+        # (\r\n, \r, \u2028, ...) becomes \n, as the old line loop did
+        text = "\n".join(text.splitlines())
+        m = _STOP_RE.search(text)
+        if m:
+            text = text[:m.start()]
+
+        return text.strip().strip('"').strip("'")
+
+    # --------------------------------------------------
+    # HTTP transport
+    # --------------------------------------------------
+    # Bodies are encoded/decoded here rather than via json= so orjson is used;
+    # Content-Type is already set on both clients
+    def _post(self, payload: dict) -> dict:
+        body = _json_dumps(payload)
+        if self.http2_client is None:
+            response = self.session.post(self.endpoint, data=body, timeout=(10, 180))
+            response.raise_for_status()
+            return _json_loads(response.content)
+
+        # httpx transports only retry failed connects; mirror the session's Retry
+        for attempt in range(RETRY_TOTAL + 1):
+            try:
+                response = self.http2_client.post(self.endpoint, content=body)
+            except httpx.TransportError:
+                if attempt == RETRY_TOTAL:
+                    raise
+                time.sleep(_retry_delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
                 break
-            lines.append(line)
+            time.sleep(_retry_delay(attempt, response))
+        response.raise_for_status()
+        return _json_loads(response.content)
 
-        cleaned = "\n".join(lines)
-        return cleaned.strip().strip('"').strip("'")
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        # An AsyncClient's pool belongs to the loop it was first used on
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            self._aclient = httpx.AsyncClient(
+                http2=http2,
+                headers=self._headers,
+                limits=httpx.Limits(max_connections=max(64, self.max_workers)),
+                timeout=httpx.Timeout(180.0, connect=10.0),
+            )
+            self._aclient_loop = loop
+        return self._aclient
+
+    async def aclose(self):
+        """Close the async client; call before the event loop that used it exits."""
+        client, self._aclient, self._aclient_loop = self._aclient, None, None
+        if client is not None:
+            await client.aclose()
+
+    async def _apost(self, payload: dict) -> dict:
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self._post, payload)
+
+        client = self._get_async_client()
+        body = _json_dumps(payload)
+        # Mirror the requests session's retry policy
+        for attempt in range(RETRY_TOTAL + 1):
+            try:
+                response = await client.post(self.endpoint, content=body)
+            except httpx.TransportError:
+                if attempt == RETRY_TOTAL:
+                    raise
+                await asyncio.sleep(_retry_delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                break
+            await asyncio.sleep(_retry_delay(attempt, response))
+        response.raise_for_status()
+        return _json_loads(response.content)
 
     # --------------------------------------------------
-    # Public API
+    # Request helpers
     # --------------------------------------------------
-    def translate(self, text: str, target_lang: str) -> str:
-        if not text or not text.strip():
-            return ""
+    def _system_message(self, target_lang: str) -> dict:
+        key = target_lang.lower()
+        message = self._system_msgs.get(key)
+        if message is None:
+            message = self._system_msgs[key] = {
+                "role": "system",
+                "content": SYSTEM_PROMPT_TEMPLATE.format(lang=target_lang.capitalize()),
+            }
+        return message
 
-        payload = {
-            "model": self.model,
-            "temperature": 0.1,
+    def _build_payload(self, user_content: str, target_lang: str) -> dict:
+        return {
+            **self._payload_template,
             "messages": [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a professional translator.\n"
-                        f"Target Language: {target_lang.capitalize()}\n"
-                        "CRITICAL RULES:\n"
-                        "1. Output ONLY the translated text.\n"
-                        "2. Do NOT provide explanations or notes.\n"
-                        "3. Preserve paragraph breaks and punctuation.\n"
-                        "4. Maintain tone of the source."
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": f"Translate this text into {target_lang.capitalize()}:\n\n{text}"
-                }
-            ]
+                self._system_message(target_lang),
+                {"role": "user", "content": user_content},
+            ],
         }
 
-        try:
-            response = self.session.post(self.endpoint, json=payload, timeout=(10, 180))
-            response.raise_for_status()
-            data = response.json()
+    def _single_payload(self, text: str, target_lang: str) -> dict:
+        return self._build_payload(
+            f"Translate this text into {target_lang.capitalize()}:\n\n{text}", target_lang
+        )
 
-            if "error" in data:
-                raise RuntimeError(f"API Error: {data['error'].get('message', 'Unknown error')}")
+    def _batch_payload(self, texts: List[str], target_lang: str) -> dict:
+        segments = "\n".join(f"<<<P{i}>>>\n{t}" for i, t in enumerate(texts))
+        return self._build_payload(
+            f"Translate each segment into {target_lang.capitalize()}. "
+            "Return in same format, keeping every <<<P#>>> marker on its own line.\n"
+            f"{segments}",
+            target_lang,
+        )
+
+    def _split_batch(self, content: str, count: int) -> Optional[List[str]]:
+        """Split a batched reply into cleaned segments, or None if it doesn't line up.
+
+        Segments the model left empty come back as ``""`` for the caller to retry.
+        """
+        parsed = {int(m.group(1)): m.group(2) for m in _BATCH_RE.finditer(content or "")}
+        if sorted(parsed) != list(range(count)):
+            logger.warning(f"Batch reply had {len(parsed)}/{count} segments; translating individually")
+            return None
+        segments = [self._clean_output(parsed[i]) for i in range(count)]
+        empty = sum(1 for seg in segments if not seg)
+        if empty:
+            logger.warning(f"Batch reply left {empty}/{count} segments empty; translating those individually")
+        return segments
 
-            content = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                choice = data["choices"][0]
-                content = choice.get("message", {}).get("content", "") or choice.get("text", "")
+    @staticmethod
+    def _extract_content(data: dict) -> str:
+        if "error" in data:
+            raise RuntimeError(f"API Error: {data['error'].get('message', 'Unknown error')}")
 
-            if not content:
-                logger.warning("API returned empty string")
-                return ""
+        content = ""
+        if "choices" in data and len(data["choices"]) > 0:
+            choice = data["choices"][0]
+            content = choice.get("message", {}).get("content", "") or choice.get("text", "")
 
-            return self._clean_output(content)
+        if not content:
+            logger.warning("API returned empty string")
+        return content
 
-        except requests.exceptions.RequestException as e:
+    @contextmanager
+    def _api_errors(self):
+        try:
+            yield
+        except NETWORK_ERRORS as e:
             logger.error(f"Network/API error: {e}")
             raise RuntimeError(f"Featherless API request failed: {e}")
         except Exception as e:
             logger.exception("Translation failed")
             raise RuntimeError(f"Unexpected error: {e}")
 
+    def _complete(self, payload: dict) -> str:
+        """Send a chat completion and return the raw message content."""
+        with self._api_errors():
+            return self._extract_content(self._post(payload))
+
+    async def _acomplete(self, payload: dict) -> str:
+        with self._api_errors():
+            return self._extract_content(await self._apost(payload))
+
+    @staticmethod
+    def _chunk(indices: List[int], texts: List[str]) -> List[List[int]]:
+        """Group indices into batches bounded by count and approximate tokens."""
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        tokens = 0
+        for i in indices:
+            cost = len(texts[i]) // 4
+            if current and (len(current) >= BATCH_SIZE or tokens + cost > BATCH_MAX_TOKENS):
+                chunks.append(current)
+                current, tokens = [], 0
+            current.append(i)
+            tokens += cost
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _plan(self, texts: List[str], target_lang: str) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Fill cached and untranslatable results, grouping the rest by stripped source."""
+        results = [""] * len(texts)
+
+        # Identical paragraphs are translated once; cached ones not at all
+        pending: Dict[str, List[int]] = {}
+        hits = skipped = 0
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            if _SKIP_RE.match(text.strip()):
+                results[i] = text
+                skipped += 1
+                continue
+            cached = self.cache.get(self.cache.make_key(text, target_lang, self.model))
+            if cached is not None:
+                results[i] = cached
+                hits += 1
+            else:
+                pending.setdefault(text.strip(), []).append(i)
+
+        logger.info(
+            f"Translating {len(pending)} unique paragraphs to {target_lang} "
+            f"(cache_hits={hits}, skipped={skipped}, total={len(texts)})"
+        )
+        return results, pending
+
+    def _store(self, results: List[str], pending: Dict[str, List[int]],
+               source: str, translated: str, target_lang: str) -> int:
+        self.cache.set(self.cache.make_key(source, target_lang, self.model), translated)
+        for i in pending[source]:
+            results[i] = translated
+        return len(pending[source])
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def translate(self, text: str, target_lang: str) -> str:
+        if not text or not text.strip():
+            return ""
+        if _SKIP_RE.match(text.strip()):
+            return text
+
+        key = self.cache.make_key(text, target_lang, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        content = self._complete(self._single_payload(text, target_lang))
+        translated = self._clean_output(content) if content else ""
+        self.cache.set(key, translated)
+        return translated
+
+    async def translate_async(self, text: str, target_lang: str) -> str:
+        if not text or not text.strip():
+            return ""
+        if _SKIP_RE.match(text.strip()):
+            return text
+
+        key = self.cache.make_key(text, target_lang, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        content = await self._acomplete(self._single_payload(text, target_lang))
+        translated = self._clean_output(content) if content else ""
+        self.cache.set(key, translated)
+        return translated
+
+    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        """Translate several segments in one request.
+
+        Falls back to one request per segment if the reply can't be split
+        back into the same segments, and for any segment it left empty.
+        """
+        if len(texts) > 1:
+            content = self._complete(self._batch_payload(texts, target_lang))
+            segments = self._split_batch(content, len(texts))
+            if segments is not None:
+                return [seg or self.translate(t, target_lang) for seg, t in zip(segments, texts)]
+        return [self.translate(t, target_lang) for t in texts]
+
+    async def translate_batch_async(self, texts: List[str], target_lang: str) -> List[str]:
+        # Fallbacks run one at a time, like translate_batch: the caller's
+        # semaphore slot stands for a single request in flight
+        if len(texts) > 1:
+            content = await self._acomplete(self._batch_payload(texts, target_lang))
+            segments = self._split_batch(content, len(texts))
+            if segments is not None:
+                return [seg or await self.translate_async(t, target_lang) for seg, t in zip(segments, texts)]
+        return [await self.translate_async(t, target_lang) for t in texts]
+
+    def translate_many(
+        self,
+        texts: List[str],
+        target_lang: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[str]:
+        """Translate texts in concurrent batches, returning results in input order.
+
+        Duplicate, previously cached and untranslatable (numbers, punctuation,
+        URLs) paragraphs are not sent to the API.
+
+        ``on_progress(done, total)`` is called after each text completes.
+        """
+        results, pending = self._plan(texts, target_lang)
+        unique = list(pending)
+        total = len(texts)
+        done = total - sum(len(idx) for idx in pending.values())
+
+        if on_progress and done:
+            on_progress(done, total)
+        if not unique:
+            return results
+
+        chunks = self._chunk(list(range(len(unique))), unique)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            futures = {
+                executor.submit(self.translate_batch, [unique[u] for u in chunk], target_lang): chunk
+                for chunk in chunks
+            }
+            try:
+                for future in as_completed(futures):
+                    for u, translated in zip(futures[future], future.result()):
+                        done += self._store(results, pending, unique[u], translated, target_lang)
+                    if on_progress:
+                        on_progress(done, total)
+            except Exception:
+                # Don't keep spending API calls on a job that already failed
+                for f in futures:
+                    f.cancel()
+                raise
+
+        return results
+
+    async def translate_many_async(
+        self,
+        texts: List[str],
+        target_lang: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[str]:
+        """Coroutine version of :meth:`translate_many`, bounded by a semaphore instead of threads."""
+        results, pending = self._plan(texts, target_lang)
+        unique = list(pending)
+        total = len(texts)
+        done = total - sum(len(idx) for idx in pending.values())
+
+        if on_progress and done:
+            on_progress(done, total)
+        if not unique:
+            return results
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(chunk: List[int]):
+            nonlocal done
+            async with semaphore:
+                translated = await self.translate_batch_async([unique[u] for u in chunk], target_lang)
+            for u, text in zip(chunk, translated):
+                done += self._store(results, pending, unique[u], text, target_lang)
+            if on_progress:
+                on_progress(done, total)
+
+        tasks = [asyncio.ensure_future(run(chunk)) for chunk in self._chunk(list(range(len(unique))), unique)]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            # Don't keep spending API calls on a job that already failed
+            for t in tasks:
+                t.cancel()
+            raise
+
+        return results
+
 
 # -------------------- TEST --------------------
 if __name__ == "__main__":
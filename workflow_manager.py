@@ -38,13 +38,16 @@ class WorkflowNodes:
         """Syncs the internal graph state with your FastAPI jobs_db."""
         jid = state["job_id"]
         if jid in self.jobs_db:
-            self.jobs_db[jid].update({
+            # Reassign so shared (Manager) dicts see the change too
+            job = self.jobs_db[jid]
+            job.update({
                 "status": state["status"],
                 "progress": state["progress"],
                 "message": message,
                 "complete": state.get("complete", False),
                 "error": state.get("error") is not None
             })
+            self.jobs_db[jid] = job
 
     def extract_node(self, state: AgentState) -> AgentState:
         try:
@@ -78,16 +81,14 @@ class WorkflowNodes:
             for idx, lang in enumerate(state["languages"]):
                 self._update_db(state, f"Translating to {lang.title()}...")
 
-                translated_data = []
-                for p in state.get("paragraphs", []):
-                    text_to_translate = p.get("text", "").strip()
-                    style = p.get("style", "Normal")
-                    if not text_to_translate:
-                        translated_data.append({"text": "", "style": style})
-                        continue
-
-                    trans_text = self.translator.translate(text_to_translate, lang)
-                    translated_data.append({"text": trans_text, "style": style})
+                paragraphs = state.get("paragraphs", [])
+                texts = self.translator.translate_many(
+                    [p.get("text", "").strip() for p in paragraphs], lang
+                )
+                translated_data = [
+                    {"text": trans_text, "style": p.get("style", "Normal")}
+                    for p, trans_text in zip(paragraphs, texts)
+                ]
 
                 state["translations"][lang] = translated_data
                 state["progress"] = int(10 + ((idx + 1) / total_langs) * 70)